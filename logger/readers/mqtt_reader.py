@@ -24,13 +24,30 @@ class MQTTReader(Reader):
     Read messages from an mqtt broker
     """
 
-    def __init__(self, broker, channel, client_name):
+    def __init__(self, broker, channel, client_name, batch=False,
+                 return_message=False, encoding='utf-8', encoding_errors='ignore'):
         """
         Read text records from the channel subscription.
         ```
 
         broker       MQTT broker to connect, broker format[###.###.#.#]
         channel     MQTT channel to read from, channel format[@broker/path_of_subscripton]
+        batch       If True, read() returns a list of all messages that have
+                    arrived since the last call, rather than a single
+                    message per call.
+        return_message If True, return paho's MQTTMessage objects as received,
+                    rather than their payloads. Nothing is decoded or copied;
+                    message.payload is the same bytes object paho handed us,
+                    and message.topic is available for routing.
+
+        encoding - 'utf-8' by default. If empty or None, do not attempt any decoding
+                and return raw bytes. Other possible encodings are listed in online
+                documentation here:
+                https://docs.python.org/3/library/codecs.html#standard-encodings
+
+        encoding_errors - 'ignore' by default. Other error strategies are 'strict',
+                'replace', and 'backslashreplace', described here:
+                https://docs.python.org/3/howto/unicode.html#encodings
         ```
         Instructions on how to start an MQTT broker:
 
@@ -67,30 +84,49 @@ class MQTTReader(Reader):
         ```
         """
 
-        super().__init__(output_format=Text)
+        super().__init__(output_format=Text,
+                         encoding=encoding,
+                         encoding_errors=encoding_errors)
 
         if not PAHO_ENABLED:
             raise ModuleNotFoundError('MQTTReader(): paho-mqtt is not installed. Please '
                                       'try "pip install paho-mqtt" prior to use.')
 
+        # Subscribe on every (re)connect so the subscription survives a
+        # dropped connection.
         def on_connect(client, userdata, flags, rc):
             logging.warn("Connected With Result Code: {}".format(rc))
+            client.subscribe(self.channel)
 
+        def on_disconnect(client, userdata, rc):
+            if rc != 0:
+                logging.warning('Unexpectedly disconnected from broker at %s '
+                                '(result code %s); will try to reconnect',
+                                self.broker, rc)
+
+        # Called from paho's network thread, so hand messages over
+        # through a thread-safe Queue.
         def on_message(client, userdata, message):
             self.queue.put(message)
 
         self.broker = broker
         self.channel = channel
         self.client_name = client_name
+        self.batch = batch
+        self.return_message = return_message
         self.queue = Queue()
 
         try:
             self.paho = mqtt.Client(client_name)
             self.paho.on_connect = on_connect
+            self.paho.on_disconnect = on_disconnect
             self.paho.on_message = on_message
 
             self.paho.connect(broker, 1883)
-            self.paho.subscribe(channel)
+
+            # Let paho run the network loop (and reconnects) in its own
+            # thread; read() just blocks until a message shows up.
+            self.paho.loop_start()
 
         except mqtt.WebsocketConnectionError as e:
             logging.error('Unable to connect to broker at %s:%s',
@@ -99,15 +135,32 @@ class MQTTReader(Reader):
 
     ############################
     def read(self):
-        while True:
-            try:
-                self.paho.loop()
-                while not self.queue.empty():
-                    message = self.queue.get()
-                    if message is None:
-                        continue
+        try:
+            while True:
+                message = self.queue.get()
+                if not self.batch:
                     logging.debug('Got message "%s"', message.payload)
-                    return message.payload
-            except KeyboardInterrupt:
-                self.paho.disconnect()
-                exit(0)
+                    if self.return_message:
+                        return message
+                    # An empty or undecodable payload decodes to None,
+                    # which callers would take as EOF; wait for the next one.
+                    record = self._decode_bytes(message.payload)
+                    if record is not None:
+                        return record
+                    continue
+
+                # Pick up anything else that has arrived, without blocking again
+                messages = [message]
+                while not self.queue.empty():
+                    messages.append(self.queue.get_nowait())
+                logging.debug('Got %d messages', len(messages))
+                if self.return_message:
+                    return messages
+                records = [self._decode_bytes(m.payload) for m in messages]
+                records = [r for r in records if r is not None]
+                if records:
+                    return records
+        except KeyboardInterrupt:
+            self.paho.loop_stop()
+            self.paho.disconnect()
+            exit(0)
@@ -9,6 +9,9 @@ from logger.utils import formats  # noqa: E402
 from logger.utils.das_record import DASRecord  # noqa: E402
 from logger.transforms.transform import Transform  # noqa: E402
 
+# Max and Min only make sense for these types
+NUMERIC_TYPES = (int, float, bool)
+
 
 ################################################################################
 #
@@ -35,6 +38,11 @@ class MaxMinTransform(Transform):
         self.max = {}
         self.min = {}
 
+        # Output keys ('field:max', 'field:min') for each field we've
+        # seen, so we don't build new strings every time a limit moves.
+        self.max_keys = {}
+        self.min_keys = {}
+
     ############################
     def transform(self, record):
         """Does record exceed any previously-observed bounds?"""
@@ -50,7 +58,8 @@ class MaxMinTransform(Transform):
                 results.append(self.transform(single_record))
             return results
 
-        if type(record) is DASRecord:
+        is_das = type(record) is DASRecord
+        if is_das:
             fields = record.fields
         elif type(record) is dict:
             fields = record
@@ -59,26 +68,40 @@ class MaxMinTransform(Transform):
                             'DASRecord or dict. Received type "%s"', type(record))
             return None
 
-        new_limits = {}
+        # Most records set no new limits, so don't create a dict for
+        # them until we know we need one.
+        new_limits = None
 
         for field, value in fields.items():
-            # Max and Min only make sense for int, float and bool
-            if not type(value) in [int, float, bool]:
+            if not isinstance(value, NUMERIC_TYPES):
+                continue
+
+            if field not in self.max:
+                self.max_keys[field] = field + ':max'
+                self.min_keys[field] = field + ':min'
+                self.max[field] = self.min[field] = value
+                if new_limits is None:
+                    new_limits = {}
+                new_limits[self.max_keys[field]] = value
+                new_limits[self.min_keys[field]] = value
                 continue
 
-            if field not in self.max or value > self.max[field]:
+            if value > self.max[field]:
                 self.max[field] = value
-                new_limits[field + ':max'] = value
-            if field not in self.min or value < self.min[field]:
+                if new_limits is None:
+                    new_limits = {}
+                new_limits[self.max_keys[field]] = value
+            if value < self.min[field]:
                 self.min[field] = value
-                new_limits[field + ':min'] = value
+                if new_limits is None:
+                    new_limits = {}
+                new_limits[self.min_keys[field]] = value
 
-        if not new_limits:
+        if new_limits is None:
             return None
 
-        if type(record) is DASRecord:
-            if record.data_id:
-                data_id = record.data_id + '_limits' if record.data_id else 'limits'
+        if is_das:
+            data_id = record.data_id + '_limits' if record.data_id else 'limits'
             return DASRecord(data_id=data_id,
                              message_type=record.message_type,
                              timestamp=record.timestamp,
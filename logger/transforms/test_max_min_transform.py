@@ -34,6 +34,14 @@ class TestMaxMinTransform(unittest.TestCase):
         self.assertEqual(result.data_id, 'foo_limits')
         self.assertDictEqual(result.fields, {'f2:min': 1.0})
 
+    ############################
+    def test_das_record_no_data_id(self):
+        max_min = MaxMinTransform()
+        record = DASRecord(message_type='bar', fields={'f1': 1.1})
+        result = max_min.transform(record)
+        self.assertEqual(result.data_id, 'limits')
+        self.assertDictEqual(result.fields, {'f1:max': 1.1, 'f1:min': 1.1})
+
 
 ################################################################################
 if __name__ == '__main__':
@@ -91,6 +91,17 @@ class LogfileWriter(Writer):
         self.current_filename = {}
         self.writer = {}
 
+        # Formatting the date suffix is the costliest part of write(), and
+        # files roll over at most hourly, so remember the suffix for the
+        # last hour we saw - unless date_format asks for finer resolution,
+        # which we detect by formatting the start and end of some hour.
+        hour_start = 1700000000 // 3600 * 3600  # any whole hour will do
+        self.cache_time_str = (
+            timestamp.date_str(hour_start, date_format=self.date_format) ==
+            timestamp.date_str(hour_start + 3599.999, date_format=self.date_format))
+        self.last_time_str_hour = None
+        self.last_time_str = None
+
     ############################
     def write(self, record):
         if record is None:
@@ -120,7 +131,7 @@ class LogfileWriter(Writer):
 
         elif isinstance(record, str):  # If str, it better begin with time string
             try:  # Try to extract timestamp from record
-                time_str = record.split(self.split_char)[0]
+                time_str = record.partition(self.split_char)[0]
                 ts = timestamp.timestamp(time_str, time_format=self.time_format)
             except ValueError:
                 if not self.quiet:
@@ -133,11 +144,7 @@ class LogfileWriter(Writer):
             return
 
         # Now parse ts into hour and date strings
-        hr_str = self.rollover_hourly and \
-            timestamp.date_str(ts, date_format='_%H00') or ""
-        date_str = timestamp.date_str(ts, date_format=self.date_format)
-        time_str = date_str + hr_str + self.suffix
-        logging.debug('LogfileWriter time_str: %s', time_str)
+        time_str = self.get_time_str(ts)
 
         # Figure out where we're going to write
         if self.do_filebase_mapping:
@@ -152,6 +159,24 @@ class LogfileWriter(Writer):
             filename = self.filebase + '-' + time_str
             self.write_filename(record, pattern, filename)
 
+    ############################
+    def get_time_str(self, ts):
+        """Return the date (and possibly hour) suffix for timestamp ts,
+        reusing the previous one if ts falls in the same hour."""
+        hour = int(ts // 3600)
+        if self.cache_time_str and hour == self.last_time_str_hour:
+            return self.last_time_str
+
+        hr_str = self.rollover_hourly and \
+            timestamp.date_str(ts, date_format='_%H00') or ""
+        date_str = timestamp.date_str(ts, date_format=self.date_format)
+        time_str = date_str + hr_str + self.suffix
+        logging.debug('LogfileWriter time_str: %s', time_str)
+
+        self.last_time_str_hour = hour
+        self.last_time_str = time_str
+        return time_str
+
     ############################
     def write_if_match(self, record, pattern, time_str):
         """If the record matches the pattern, write to the matching filebase."""
@@ -105,6 +105,38 @@ class TestLogfileWriter(unittest.TestCase):
                 lines = outfile.read()
                 self.assertEqual(lines, SAMPLE_DATA_DASRECORD_STR)
 
+    ############################
+    def test_rollover_hourly(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            filebase = tmpdirname + '/logfile'
+
+            writer = LogfileWriter(filebase, rollover_hourly=True)
+            writer.write(SAMPLE_DATA_DICT)
+            writer.write({'timestamp': 1691413200.0, 'fields': {'F1': 8.26}})
+
+            with open(filebase + '-2023-08-07_1200', 'r') as outfile:
+                self.assertEqual(outfile.read(), SAMPLE_DATA_DICT_STR)
+            with open(filebase + '-2023-08-07_1300', 'r') as outfile:
+                self.assertEqual(outfile.read(),
+                                 '{"timestamp": 1691413200.0, "fields": {"F1": 8.26}}\n')
+
+    ############################
+    def test_sub_hour_date_format(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            filebase = tmpdirname + '/logfile'
+
+            # %R is %H:%M, so records minutes apart go to different files
+            writer = LogfileWriter(filebase, date_format='%Y-%m-%dT%R')
+            writer.write(SAMPLE_DATA_DICT[0])
+            writer.write({'timestamp': 1691410778.0, 'fields': {'F1': 8.26}})
+
+            with open(filebase + '-2023-08-07T12:17', 'r') as outfile:
+                self.assertEqual(outfile.readline(), SAMPLE_DATA_DICT_STR.split('\n')[0] + '\n')
+                self.assertEqual(outfile.readline(), '')
+            with open(filebase + '-2023-08-07T12:19', 'r') as outfile:
+                self.assertEqual(outfile.read(),
+                                 '{"timestamp": 1691410778.0, "fields": {"F1": 8.26}}\n')
+
     ############################
     def test_map_write(self):
         with tempfile.TemporaryDirectory() as tmpdirname:
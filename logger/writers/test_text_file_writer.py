@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 
+import contextlib
+import gc
+import io
 import logging
+import os
 import sys
 import tempfile
+import threading
 import time
 import unittest
 
+from unittest import mock
+
 from os.path import dirname, realpath
 sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
 from logger.readers.text_file_reader import TextFileReader  # noqa: E402
@@ -71,6 +78,87 @@ class TestTextFileWriter(unittest.TestCase):
                 for line in SAMPLE_DATA:
                     self.assertEqual(line, f.readline().strip())
 
+    ############################
+    def test_write_list(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            writer = TextFileWriter(tmpdirname + '/f')
+            writer.write(SAMPLE_DATA[:2] + [None] + SAMPLE_DATA[2:])
+            with open(tmpdirname + '/f') as f:
+                self.assertEqual(f.read(), '\n'.join(SAMPLE_DATA) + '\n')
+
+            # Lists of lists, e.g. from a transform that returns a list
+            # per record, get flattened.
+            writer.write([SAMPLE_DATA[:2], None, [[SAMPLE_DATA[2]]]])
+            with open(tmpdirname + '/f') as f:
+                self.assertEqual(f.read(), 2 * ('\n'.join(SAMPLE_DATA) + '\n'))
+
+    ############################
+    def test_short_writes(self):
+        # Simulate a pty or pipe that only takes a few bytes at a time
+        def short_writev(fd, buffers):
+            return os.write(fd, bytes(buffers[0][:3]))
+
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            with mock.patch('logger.writers.text_file_writer.os.writev', short_writev):
+                writer = TextFileWriter(tmpdirname + '/f', header=SAMPLE_HEADER)
+                writer.write(SAMPLE_DATA)
+            with open(tmpdirname + '/f') as f:
+                self.assertEqual(f.read(), '\n'.join([SAMPLE_HEADER] + SAMPLE_DATA) + '\n')
+
+    ############################
+    def test_buffered_write(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            writer = TextFileWriter(tmpdirname + '/f', flush=False,
+                                    flush_bytes=25, flush_interval=1000)
+            writer.write(SAMPLE_DATA[0])
+            writer.write(SAMPLE_DATA[1])
+            with open(tmpdirname + '/f') as f:
+                self.assertEqual('', f.read())
+
+            # Third record takes us past flush_bytes
+            writer.write(SAMPLE_DATA[2])
+            with open(tmpdirname + '/f') as f:
+                for line in SAMPLE_DATA:
+                    self.assertEqual(line, f.readline().strip())
+
+    ############################
+    def test_async_flush(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            writer = TextFileWriter(tmpdirname + '/f', async_flush=True)
+            for line in SAMPLE_DATA:
+                writer.write(line)
+            writer.write(SAMPLE_DATA)
+            writer.close()
+            self.assertFalse(writer.flusher.thread.is_alive())
+
+            with open(tmpdirname + '/f') as f:
+                self.assertEqual(f.read(), 2 * ('\n'.join(SAMPLE_DATA) + '\n'))
+
+    ############################
+    def test_async_flush_dropped_writer(self):
+        # A writer that's just dropped, without close(), must still get
+        # every record it was handed into the file.
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            writer = TextFileWriter(tmpdirname + '/f', async_flush=True)
+            thread = writer.flusher.thread
+            for i in range(20000):
+                writer.write(str(i))
+            del writer
+            gc.collect()
+            self.assertFalse(thread.is_alive())
+
+            with open(tmpdirname + '/f') as f:
+                self.assertEqual(f.read().splitlines(), [str(i) for i in range(20000)])
+
+    ############################
+    def test_async_flush_open_fails(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            threads = threading.active_count()
+            with self.assertRaises(FileNotFoundError):
+                TextFileWriter(tmpdirname + '/no/such/dir/f', create_path=False,
+                               async_flush=True)
+            self.assertEqual(threads, threading.active_count())
+
     ############################
     def test_compatible(self):
         # Don't specify 'tail' and expect there to be no data
@@ -91,6 +179,16 @@ class TestTextFileWriter(unittest.TestCase):
         with self.assertRaises(TypeError):
             writer.input_format('not a format')
 
+    ############################
+    def test_write_stdout(self):
+        # Writer keeps writing to the stdout it started with, even once
+        # sys.stdout has been put back.
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            writer = TextFileWriter(filename=None, header=SAMPLE_HEADER)
+        writer.write(SAMPLE_DATA)
+        self.assertEqual(stdout.getvalue(), '\n'.join([SAMPLE_HEADER] + SAMPLE_DATA) + '\n')
+
     ############################
     def test_split(self):
         """Test the split_by_date parameter, changing the date with each write."""
@@ -112,6 +210,27 @@ class TestTextFileWriter(unittest.TestCase):
             with open(tmpdirname + '/g-%04d-%02d-%02d' % writer.today) as f:
                 self.assertEqual(SAMPLE_DATA[2], f.readline().strip())
 
+    ############################
+    def test_split_clock_steps(self):
+        """Test that split_by_date follows the clock when it jumps forward
+        or back, e.g. when NTP corrects a bad clock."""
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            with mock.patch('logger.writers.text_file_writer.time.time') as mock_time:
+                mock_time.return_value = 1760000000  # 2025-10-09
+                writer = TextFileWriter(tmpdirname + '/g', split_by_date=True)
+                writer.write(SAMPLE_DATA[0])
+
+                mock_time.return_value = 1900000000  # 2030-03-17
+                writer.write(SAMPLE_DATA[1])
+
+                mock_time.return_value = 1760000100  # back to 2025-10-09
+                writer.write(SAMPLE_DATA[2])
+
+            with open(tmpdirname + '/g-2025-10-09') as f:
+                self.assertEqual(f.read(), SAMPLE_DATA[0] + '\n' + SAMPLE_DATA[2] + '\n')
+            with open(tmpdirname + '/g-2030-03-17') as f:
+                self.assertEqual(f.read(), SAMPLE_DATA[1] + '\n')
+
 
 if __name__ == '__main__':
     unittest.main(warnings='ignore')
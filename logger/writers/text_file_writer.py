@@ -1,27 +1,155 @@
 #!/usr/bin/env python3
 
-import os.path
+import atexit
+import logging
+import os
 import sys
-import datetime
+import threading
+import time
 
 from os.path import dirname, realpath
 sys.path.append(dirname(dirname(dirname(realpath(__file__)))))
 from logger.utils.formats import Text  # noqa: E402
 from logger.writers.writer import Writer  # noqa: E402
 
+NEWLINE = b'\n'
+
+# Most buffers we can hand to a single os.writev() call
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, OSError, ValueError):
+    IOV_MAX = -1
+if IOV_MAX <= 0:
+    IOV_MAX = 1024
+
+# Most encoded chunks we'll let pile up for the async flush thread
+# before write() has to wait for it to catch up.
+MAX_PENDING_CHUNKS = 65536
+
+# Async flushers that are still running, so we can drain them at exit
+ACTIVE_FLUSHERS = set()
+
+
+################################################################################
+def write_chunks(file, chunks, text=False):
+    """Write a list of encoded chunks to an unbuffered file and flush, using
+    as few system calls as we can. If text is True, file is a text stream,
+    such as stdout, and gets the decoded chunks instead."""
+    if not chunks:
+        return
+    if text:
+        file.write(b''.join(chunks).decode())
+        file.flush()
+        return
+
+    # writev() may stop short (e.g. on a pty or pipe), so skip past
+    # whatever made it out and go around again with the rest.
+    fd = file.fileno()
+    i = 0
+    while i < len(chunks):
+        written = os.writev(fd, chunks[i:i + IOV_MAX])
+        while i < len(chunks) and written >= len(chunks[i]):
+            written -= len(chunks[i])
+            i += 1
+        if written:
+            chunks[i] = chunks[i][written:]
+
+
+################################################################################
+class AsyncFlusher:
+    """Background thread that writes queued chunks to a TextFileWriter's
+    current file. Kept apart from the writer so that the thread doesn't hold
+    a reference to it: a writer that is simply dropped still gets collected,
+    and its __del__ drains the queue."""
+
+    def __init__(self):
+        self.file = None
+        self.text = False
+        self.pending = []
+        self.cond = threading.Condition()
+        self.flushing = False
+        self.closing = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        ACTIVE_FLUSHERS.add(self)
+        self.thread.start()
+
+    ############################
+    def queue(self, chunks):
+        """Queue encoded chunks for writing, waiting if the thread has
+        fallen too far behind."""
+        with self.cond:
+            while len(self.pending) >= MAX_PENDING_CHUNKS:
+                self.cond.wait()
+            self.pending.extend(chunks)
+            self.cond.notify_all()
+
+    ############################
+    def wait(self):
+        """Wait until everything queued so far has been written out."""
+        with self.cond:
+            while self.pending or self.flushing:
+                self.cond.wait()
+
+    ############################
+    def close(self):
+        """Write out everything queued and stop the thread."""
+        ACTIVE_FLUSHERS.discard(self)
+        with self.cond:
+            self.closing = True
+            self.cond.notify_all()
+        if self.thread is not threading.current_thread():
+            self.thread.join()
+
+    ############################
+    def _run(self):
+        """Write out whatever has been queued until we're closed and there's
+        nothing left."""
+        while True:
+            with self.cond:
+                while not self.pending and not self.closing:
+                    self.cond.wait()
+                if not self.pending:
+                    return
+                chunks, self.pending = self.pending, []
+                self.flushing = True
+                self.cond.notify_all()
+
+            try:
+                write_chunks(self.file, chunks, self.text)
+            except OSError as e:
+                logging.error('TextFileWriter: unable to write to %s: %s',
+                              getattr(self.file, 'name', self.file), e)
+            finally:
+                with self.cond:
+                    self.flushing = False
+                    self.cond.notify_all()
+
+
+def close_active_flushers():
+    """Drain any async flushers whose writers are still around at exit."""
+    for flusher in list(ACTIVE_FLUSHERS):
+        flusher.close()
+
+
+atexit.register(close_active_flushers)
+
 
 class TextFileWriter(Writer):
     """Write to the specified file. If filename is empty, write to stdout."""
 
     def __init__(self, filename=None, flush=True, truncate=False,
                  split_by_date=False, create_path=True, header=None,
-                 header_file=None):
+                 header_file=None, flush_bytes=65536, flush_interval=1.0,
+                 async_flush=False):
         """Write text records to a file. If no filename is specified, write to
         stdout.
         ```
         filename     Name of file to write to. If None, write to stdout
 
-        flush        If True (default), flush after every write() call
+        flush        If True (default), flush after every write() call. If
+                     False, hold records in memory and write them out once
+                     flush_bytes have accumulated or flush_interval seconds
+                     have passed since the last time we wrote them out.
 
         truncate     Truncate file before beginning to write
 
@@ -33,6 +161,18 @@ class TextFileWriter(Writer):
         header       Add the specified header string to each file.
 
         header_file  Add the content of the specified file to each file.
+
+        flush_bytes  If flush is False, write out buffered records once
+                     there are at least this many bytes of them.
+
+        flush_interval If flush is False, write out buffered records when a
+                     record arrives this many seconds or more after the
+                     last write-out.
+
+        async_flush  If True and flush is True, write() just queues records,
+                     and a background thread writes them to the file. Anything
+                     still queued is written out by close(), when the writer
+                     is garbage collected, or when the interpreter exits.
       ```
         """
         super().__init__(input_format=Text)
@@ -41,8 +181,15 @@ class TextFileWriter(Writer):
         self.flush = flush
         self.truncate = truncate
         self.split_by_date = split_by_date
+        self.create_path = create_path
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
         self.header = None
 
+        # Encoded records waiting to be written out if flush is False
+        self.buffer = bytearray()
+        self.last_flush = time.monotonic()
+
         if split_by_date and not filename:
             raise ValueError('TextFileWriter: filename must be specified if '
                              'split_by_date is True.')
@@ -73,21 +220,57 @@ class TextFileWriter(Writer):
         self.file_date = None
         self.file = None
 
-        # If directory doesn't exist, try to create it
-        if filename and create_path:
-            file_dir = os.path.dirname(filename)
-            if file_dir:
-                os.makedirs(file_dir, exist_ok=True)
+        # Cached result of _today(), and when it next needs recomputing
+        self.current_date = None
+        self.next_date_check = 0
+
+        # If requested, do the actual writing from a separate thread so
+        # that write() doesn't have to wait on the disk.
+        self.async_flush = async_flush and flush
+        self.flusher = AsyncFlusher() if self.async_flush else None
 
-        # Figure out what file we ought be writing to and open it.
-        self._set_file()
+        # Directories we've already made sure exist
+        self.dirs_created = set()
+
+        # Figure out what file we ought be writing to and open it. If we
+        # can't, don't leave the flush thread running.
+        try:
+            self._set_file()
+        except Exception:
+            if self.flusher:
+                self.flusher.close()
+            raise
+
+    ############################
+    def __del__(self):
+        if getattr(self, 'file', None):
+            self.close()
+
+    ############################
+    def close(self):
+        """Write out anything buffered or queued and close the file."""
+        if self.flusher:
+            self.flusher.close()
+
+        if self.file:
+            self._flush_buffer()
+            if self.filename is not None:
+                self.file.close()
+            self.file = None
 
     ############################
     def _today(self):
         """Return a tuple for (year, month, day). Broken out into a separate
         function to facilitate testing."""
-        now = datetime.datetime.utcnow()
-        return (now.year, now.month, now.day)
+        # The date only changes at midnight UTC, so don't bother looking
+        # it up again until then - or until the clock steps back before
+        # the start of the day we cached.
+        now = time.time()
+        if not self.next_date_check - 86400 <= now < self.next_date_check:
+            utcnow = time.gmtime(now)
+            self.current_date = (utcnow.tm_year, utcnow.tm_mon, utcnow.tm_mday)
+            self.next_date_check = (now // 86400 + 1) * 86400
+        return self.current_date
 
     ############################
     def _set_file(self):
@@ -100,9 +283,12 @@ class TextFileWriter(Writer):
         # If they haven't given us a filename, we'll write to stdout
         if self.filename is None:
             self.file = sys.stdout
+            if self.flusher:
+                self.flusher.file = self.file
+                self.flusher.text = True
 
             if self.header is not None:
-                self.file.write(self.header)
+                self._write(self.header.encode())
 
             return
 
@@ -114,6 +300,9 @@ class TextFileWriter(Writer):
             if self.file_date != today:
                 self.file_date = today
                 if self.file:
+                    if self.flusher:
+                        self.flusher.wait()
+                    self._flush_buffer()
                     self.file.close()
                     self.file = None
 
@@ -130,13 +319,24 @@ class TextFileWriter(Writer):
         else:
             filename = self.filename
 
-        # Open and set the file
-        mode = 'w' if self.truncate else 'a'
-        self.file = open(filename, mode)
+        # If directory doesn't exist, try to create it
+        if self.create_path:
+            file_dir = os.path.dirname(filename)
+            if file_dir and file_dir not in self.dirs_created:
+                os.makedirs(file_dir, exist_ok=True)
+                self.dirs_created.add(file_dir)
+
+        # Open and set the file. If we're flushing after every record
+        # anyway, skip Python's write buffer and hand records straight
+        # to the OS.
+        mode = 'wb' if self.truncate else 'ab'
+        self.file = open(filename, mode, buffering=0 if self.flush else -1)
+        if self.flusher:
+            self.flusher.file = self.file
 
         # Add header record to file if a header was specified.
         if self.header is not None:
-            self.file.write(self.header)
+            self._write(self.header.encode())
 
     ############################
     def write(self, record):
@@ -144,19 +344,61 @@ class TextFileWriter(Writer):
         if record is None:
             return
 
-        # If we've got a list, hope it's a list of records. Recurse,
-        # calling write() on each of the list elements in order.
-        if isinstance(record, list):
-            for single_record in record:
-                self.write(single_record)
-            return
-
         # If we're splitting by date, make sure that we're still writing
         # to the right file.
         if self.split_by_date:
             self._set_file()
 
-        # Write the record and flush if requested
-        self.file.write(str(record) + '\n')
+        # If we've got a list, hope it's a list of records (or of lists of
+        # records), and write them out together.
+        chunks = []
+        self._encode(record, chunks)
+
+        # Write the records and flush if requested
         if self.flush:
+            if self.async_flush:
+                self.flusher.queue(chunks)
+            else:
+                write_chunks(self.file, chunks, text=self.filename is None)
+            return
+
+        # Otherwise buffer them, and only write out when we've got enough
+        # or they've been sitting around for too long.
+        for chunk in chunks:
+            self.buffer.extend(chunk)
+        if len(self.buffer) >= self.flush_bytes or \
+           time.monotonic() - self.last_flush >= self.flush_interval:
+            self._flush_buffer()
+
+    ############################
+    def _encode(self, record, chunks):
+        """Append the encoded record to chunks, recursing into lists. The
+        newline goes in as a separate chunk so we don't have to build a new
+        string for every record."""
+        if record is None:
+            return
+        if isinstance(record, list):
+            for single_record in record:
+                self._encode(single_record, chunks)
+            return
+        chunks += (str(record).encode(), NEWLINE)
+
+    ############################
+    def _write(self, data):
+        """Write encoded data to the current file."""
+        if self.filename is None:
+            self.file.write(data.decode())
+        elif self.flush:
+            # Unbuffered file, whose write() may not take everything
+            write_chunks(self.file, [data])
+        else:
+            self.file.write(data)
+
+    ############################
+    def _flush_buffer(self):
+        """Write out and flush any buffered records."""
+        if self.buffer:
+            self._write(self.buffer)
+            self.buffer.clear()
             self.file.flush()
+        self.last_flush = time.monotonic()